@@ -34,6 +34,16 @@ Additional Colors:
 - Gray Dark: #374151 (for text)
 """
 
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+
+import matplotlib.colors as mcolors
+
+# Names already warned about by get_color, so a missing color is reported
+# once instead of on every plot call.
+_warned_colors = set()
+
 # Primary color palette (matplotlib tab10 colors)
 COLORS = {
     # Primary colors for main data series
@@ -74,8 +84,15 @@ COLORS = {
     'yellow_light': '#fffacd',
 }
 
-# Color assignments for specific plot types
-PLOT_COLORS = {
+# Intern the hex codes so every table below shares one str object per color;
+# repeated values ('#1f77b4' appears in several tables) then compare by
+# identity in matplotlib's color-cycle checks.
+COLORS = {name: sys.intern(value) for name, value in COLORS.items()}
+
+# Color assignments for specific plot types. The COLORS[...] references
+# resolve to plain hex strings here at import time; the proxy freezes the
+# result so lookups always hit the same flat table.
+PLOT_COLORS = MappingProxyType({
     # Detection and thresholds (keep these specific for clarity)
     'detection_threshold': COLORS['red'],
     'detection_line': COLORS['red'],
@@ -89,7 +106,7 @@ PLOT_COLORS = {
     'telemetry_data': COLORS['black'],
     'simulation_data': COLORS['red'],
     'comparison_segment': COLORS['yellow'],
-}
+})
 
 # Line styles for different plot types
 LINE_STYLES = {
@@ -112,13 +129,14 @@ MARKERS = {
     'star': '*',
 }
 
+@lru_cache(maxsize=256)
 def get_color(color_name: str) -> str:
     """
     Get a color by name from the color scheme.
-    
+
     Args:
         color_name: Name of the color (e.g., 'blue', 'co2_cabin')
-        
+
     Returns:
         Hex color code
     """
@@ -127,9 +145,33 @@ def get_color(color_name: str) -> str:
     elif color_name in COLORS:
         return COLORS[color_name]
     else:
-        print(f"Warning: Color '{color_name}' not found in color scheme. Using default blue.")
+        if color_name not in _warned_colors:
+            _warned_colors.add(color_name)
+            print(f"Warning: Color '{color_name}' not found in color scheme. Using default blue.")
         return COLORS['blue']
 
+# Hex strings parsed to RGBA once, so hot plotting loops can pass tuples and
+# skip matplotlib's string-parsing path on every artist
+_RGBA = {name: mcolors.to_rgba(value)
+         for table in (COLORS, PLOT_COLORS) for name, value in table.items()}
+
+@lru_cache(maxsize=256)
+def get_rgba(color_name: str) -> tuple:
+    """
+    Get a color by name as a precomputed RGBA tuple.
+
+    Args:
+        color_name: Name of the color (same names as get_color)
+
+    Returns:
+        (r, g, b, a) tuple of floats in [0, 1]
+    """
+    rgba = _RGBA.get(color_name)
+    if rgba is None:
+        rgba = mcolors.to_rgba(get_color(color_name))
+    return rgba
+
+@lru_cache(maxsize=None)
 def get_line_style(style_name: str) -> str:
     """
     Get a line style by name.
@@ -142,6 +184,7 @@ def get_line_style(style_name: str) -> str:
     """
     return LINE_STYLES.get(style_name, '-')
 
+@lru_cache(maxsize=None)
 def get_marker(marker_name: str) -> str:
     """
     Get a marker style by name.
@@ -168,8 +211,9 @@ COLOR_SEQUENCE = [
     COLORS['cyan'],
 ]
 
-# Scenario-specific color mapping (using sequential colors)
-SCENARIO_COLORS = {
+# Scenario-specific color mapping (using sequential colors), frozen like
+# PLOT_COLORS above
+SCENARIO_COLORS = MappingProxyType({
     'nominal': PLOT_COLORS['nominal'],  # Keep black for nominal
     'valve stuck': COLOR_SEQUENCE[0],    # Blue
     'fan degraded': COLOR_SEQUENCE[1],   # Orange
@@ -185,20 +229,26 @@ SCENARIO_COLORS = {
     'Valve+Filter': COLOR_SEQUENCE[5],   # Brown
     'Fan+Filter': COLOR_SEQUENCE[6],     # Pink
     'Valve+Fan+Filter': COLOR_SEQUENCE[7], # Gray
-}
+})
+
+# Canonical case-folded scenario table: the 'valve'/'Valve' style duplicates
+# above collapse to one entry each, and lookups become case-insensitive.
+_SCENARIO_COLORS_CF = {k.casefold(): v for k, v in SCENARIO_COLORS.items()}
 
+@lru_cache(maxsize=256)
 def get_scenario_color(scenario_name: str) -> str:
     """
-    Get color for a specific scenario.
-    
+    Get color for a specific scenario (case-insensitive).
+
     Args:
         scenario_name: Name of the scenario
-        
+
     Returns:
         Hex color code for the scenario
     """
-    return SCENARIO_COLORS.get(scenario_name, COLOR_SEQUENCE[0])
+    return _SCENARIO_COLORS_CF.get(scenario_name.casefold(), COLOR_SEQUENCE[0])
 
+@lru_cache(maxsize=None)
 def get_color_by_index(index: int) -> str:
     """
     Get color by index from the sequential color palette.
@@ -211,17 +261,33 @@ def get_color_by_index(index: int) -> str:
     """
     return COLOR_SEQUENCE[index % len(COLOR_SEQUENCE)]
 
+# Precomputed cyclic palette so get_colors_for_count is a single slice for
+# typical plot sizes instead of one function call per series
+_COLOR_CYCLE = tuple(COLOR_SEQUENCE * (256 // len(COLOR_SEQUENCE) + 1))[:256]
+
 def get_colors_for_count(count: int) -> list:
     """
     Get a list of colors for a given number of items.
-    
+
     Args:
         count: Number of colors needed
-        
+
     Returns:
         List of hex color codes
     """
-    return [get_color_by_index(i) for i in range(count)]
+    if count <= len(_COLOR_CYCLE):
+        return list(_COLOR_CYCLE[:count])
+    return [COLOR_SEQUENCE[i % len(COLOR_SEQUENCE)] for i in range(count)]
+
+def clear_color_caches() -> None:
+    """Clear all memoized color lookups (e.g. between notebook reruns)."""
+    get_color.cache_clear()
+    get_rgba.cache_clear()
+    get_line_style.cache_clear()
+    get_marker.cache_clear()
+    get_scenario_color.cache_clear()
+    get_color_by_index.cache_clear()
+    _warned_colors.clear()
 
 # =========================
 # Paper Plot Constants
@@ -241,18 +307,36 @@ PAPER_GRID_ALPHA = 0.3*2            # Grid transparency
 PAPER_GRID_STYLE = '--'           # Grid line style
 PAPER_GRID_WIDTH = 0.5*2            # Grid line width
 
+# rcParams for paper plots, built once so repeated styling calls do not
+# rebuild (and matplotlib does not revalidate) the same dict
+_PAPER_RC = {
+    'font.size': PAPER_FONT,
+    'axes.titlesize': PAPER_TITLE_FONT,
+    'axes.labelsize': PAPER_LABEL_FONT,
+    'xtick.labelsize': PAPER_TICK_FONT,
+    'ytick.labelsize': PAPER_TICK_FONT,
+    'legend.fontsize': PAPER_LEGEND_FONT,
+    'figure.titlesize': PAPER_TITLE_FONT,
+}
+
+_RC_APPLIED = False
+
+def configure_paper_rcparams(plt):
+    """Apply the paper rcParams once; later calls are no-ops."""
+    global _RC_APPLIED
+    if _RC_APPLIED:
+        return
+    plt.rcParams.update(_PAPER_RC)
+    _RC_APPLIED = True
+
+def new_paper_figure(plt):
+    """Create a new figure at the standard paper size and return it."""
+    configure_paper_rcparams(plt)
+    return plt.figure(figsize=PAPER_FIGSIZE)
+
 def apply_paper_style(plt):
     """Apply standardized paper styling to a matplotlib plot."""
-    plt.figure(figsize=PAPER_FIGSIZE)
-    plt.rcParams.update({
-        'font.size': PAPER_FONT,
-        'axes.titlesize': PAPER_TITLE_FONT,
-        'axes.labelsize': PAPER_LABEL_FONT,
-        'xtick.labelsize': PAPER_TICK_FONT,
-        'ytick.labelsize': PAPER_TICK_FONT,
-        'legend.fontsize': PAPER_LEGEND_FONT,
-        'figure.titlesize': PAPER_TITLE_FONT,
-    })
-    plt.grid(True, alpha=PAPER_GRID_ALPHA, 
-             linestyle=PAPER_GRID_STYLE, 
+    new_paper_figure(plt)
+    plt.grid(True, alpha=PAPER_GRID_ALPHA,
+             linestyle=PAPER_GRID_STYLE,
              linewidth=PAPER_GRID_WIDTH)
@@ -0,0 +1,53 @@
+"""
+Pure-Python fallback for banded Dynamic Time Warping.
+
+Used by SimilarityAgent when the dtaidistance package is not installed.
+The implementation keeps only two rolling rows of the cost matrix, so
+memory stays linear in the segment length, and honors the same
+Sakoe-Chiba band as the C-backed path.
+"""
+
+import numpy as np
+
+
+def dtw_distance(x, y, window=None):
+    """
+    Compute the banded DTW distance between two 1-D sequences.
+
+    Args:
+        x: First sequence
+        y: Second sequence
+        window: Sakoe-Chiba band width, matching dtaidistance semantics:
+            the diagonal counts toward the width, so window=1 restricts the
+            path to the diagonal itself. None means unconstrained
+
+    Returns:
+        DTW distance (square root of the accumulated squared cost)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n, m = len(x), len(y)
+    if n == 0 or m == 0:
+        return float('inf')
+    if window is None:
+        window = max(n, m)
+    # dtaidistance counts the diagonal inside the window, so the radius is
+    # one less; for unequal lengths the band runs between the start and end
+    # diagonals, widening on the longer side only
+    radius = window - 1
+    low_slack = max(0, n - m) + radius
+    high_slack = max(0, m - n) + radius
+
+    prev = np.full(m + 1, np.inf)
+    cur = np.full(m + 1, np.inf)
+    prev[0] = 0.0
+    for i in range(1, n + 1):
+        cur[:] = np.inf
+        j_start = max(1, i - low_slack)
+        j_end = min(m, i + high_slack)
+        xi = x[i - 1]
+        for j in range(j_start, j_end + 1):
+            cost = (xi - y[j - 1]) ** 2
+            cur[j] = cost + min(prev[j], cur[j - 1], prev[j - 1])
+        prev, cur = cur, prev
+    return float(np.sqrt(prev[m]))
@@ -1,10 +1,34 @@
 from typing import Dict, List, Optional, Tuple
-import math
+from concurrent.futures import ProcessPoolExecutor
+import logging
 import random
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 from color_scheme import get_color, get_line_style, get_scenario_color, get_color_by_index
 
+logger = logging.getLogger(__name__)
+
+
+# Component layout for the four CDRA filter beds.
+# State vectors (saturation, adsorption efficiency, heater status) are stored
+# as 4-element NumPy arrays indexed in this order instead of per-component dicts.
+COMPONENTS = ('desiccant_1', 'sorbent_2', 'desiccant_3', 'sorbent_4')
+COMPONENT_INDEX = {name: i for i, name in enumerate(COMPONENTS)}
+D1, S2, D3, S4 = 0, 1, 2, 3
+
+# Plot colors resolved once at import time; the plot methods index these
+# tables instead of calling back into color_scheme per artist.
+_COLOR_CYCLE = tuple(get_color_by_index(i) for i in range(10))
+_SEMANTIC_COLORS = {name: get_color(name) for name in
+                    ('detection_threshold', 'detection_line', 'detection_annotation')}
+
+# Shared annotation styling for detection markers, built once instead of as
+# dict literals inside the plot methods.
+_BBOX_PROPS = dict(boxstyle='round,pad=0.3', alpha=0.7)
+_ARROW_PROPS = dict(arrowstyle='->', connectionstyle='arc3,rad=0')
+
 
 class CDRASimulator:
     """
@@ -24,6 +48,7 @@ class CDRASimulator:
     SATURATION_TIME_CONSTANT = 600.0
     BASE_ADSORPTION_EFF = 0.05
     MAX_ADSORPTION_EFF_INCREMENT = 0.15
+    REGENERATION_RATE_MULTIPLIER = 2.0
     DESORPTION_MULTIPLIER = 1.05
     M_CABIN = 100.0
     CO2_INPUT_MEAN = 0.00002 * 30
@@ -34,6 +59,27 @@ class CDRASimulator:
     MOLAR_MASS_AIR = 28.97  # g/mol
     GAS_CONSTANT_R = 8.314  # J/(mol·K)
     STANDARD_TEMPERATURE_K = 298.15  # 25°C in Kelvin
+
+    # Single-multiply conversion factors between kg/kg air and mmHg.
+    # The Pa round trip in the step-by-step derivation cancels, leaving one
+    # constant each way — handy for converting whole arrays at once.
+    KGKG_TO_MMHG = STANDARD_PRESSURE_MMHG * MOLAR_MASS_AIR / MOLAR_MASS_CO2
+    MMHG_TO_KGKG = MOLAR_MASS_CO2 / MOLAR_MASS_AIR / STANDARD_PRESSURE_MMHG
+
+    # kg/kg-air equivalent of one unit of each supported CO2 unit; every
+    # supported conversion is linear, so the pairwise table below reduces
+    # convert_co2_units to a single lookup and multiply.
+    _KGKG_PER_UNIT = {
+        'mmHg': MMHG_TO_KGKG,
+        'kg/kg_air': 1.0,
+        'ppm': 1e-6 * MOLAR_MASS_CO2 / MOLAR_MASS_AIR,
+        'percent': 0.01 * MOLAR_MASS_CO2 / MOLAR_MASS_AIR,
+    }
+    _CONV = {}
+    for _a, _fa in _KGKG_PER_UNIT.items():
+        for _b, _fb in _KGKG_PER_UNIT.items():
+            _CONV[(_a, _b)] = _fa / _fb
+    del _a, _b, _fa, _fb
     
     def __init__(self):
         """Initialize the CDRA simulator."""
@@ -50,18 +96,8 @@ class CDRASimulator:
         Returns:
             CO2 concentration in kg/kg air
         """
-        # Convert mmHg to Pa (1 mmHg = 133.322 Pa)
-        co2_pa = co2_mmhg * 133.322
-        
-        # Use ideal gas law: n/V = P/(RT)
-        # Then convert to mass ratio: (n_CO2 * M_CO2) / (n_air * M_air)
-        # Since we're working with ratios, we can simplify
-        co2_mol_per_mol_air = co2_pa / (self.STANDARD_PRESSURE_MMHG * 133.322)
-        
-        # Convert to mass ratio
-        co2_kg_per_kg_air = co2_mol_per_mol_air * (self.MOLAR_MASS_CO2 / self.MOLAR_MASS_AIR)
-        
-        return co2_kg_per_kg_air
+        # The Pa round trip cancels; see MMHG_TO_KGKG
+        return co2_mmhg * self.MMHG_TO_KGKG
 
     def kg_per_kg_air_to_mmhg(self, co2_kg_per_kg_air: float) -> float:
         """
@@ -73,16 +109,7 @@ class CDRASimulator:
         Returns:
             CO2 partial pressure in mmHg
         """
-        # Convert mass ratio to molar ratio
-        co2_mol_per_mol_air = co2_kg_per_kg_air * (self.MOLAR_MASS_AIR / self.MOLAR_MASS_CO2)
-        
-        # Convert to partial pressure in Pa
-        co2_pa = co2_mol_per_mol_air * (self.STANDARD_PRESSURE_MMHG * 133.322)
-        
-        # Convert Pa to mmHg
-        co2_mmhg = co2_pa / 133.322
-        
-        return co2_mmhg
+        return co2_kg_per_kg_air * self.KGKG_TO_MMHG
 
     def convert_co2_units(self, value: float, from_unit: str, to_unit: str) -> float:
         """
@@ -99,47 +126,25 @@ class CDRASimulator:
         Raises:
             ValueError: If unsupported units are provided
         """
-        # First convert to kg/kg_air as intermediate unit
-        if from_unit == 'mmHg':
-            intermediate = self.mmhg_to_kg_per_kg_air(value)
-        elif from_unit == 'kg/kg_air':
-            intermediate = value
-        elif from_unit == 'ppm':
-            # ppm is parts per million by volume, convert to mass ratio
-            intermediate = value * 1e-6 * (self.MOLAR_MASS_CO2 / self.MOLAR_MASS_AIR)
-        elif from_unit == 'percent':
-            # percent by volume, convert to mass ratio
-            intermediate = value * 0.01 * (self.MOLAR_MASS_CO2 / self.MOLAR_MASS_AIR)
-        else:
-            raise ValueError(f"Unsupported source unit: {from_unit}")
-        
-        # Then convert from kg/kg_air to target unit
-        if to_unit == 'mmHg':
-            return self.kg_per_kg_air_to_mmhg(intermediate)
-        elif to_unit == 'kg/kg_air':
-            return intermediate
-        elif to_unit == 'ppm':
-            # Convert mass ratio to volume ratio (ppm)
-            volume_ratio = intermediate * (self.MOLAR_MASS_AIR / self.MOLAR_MASS_CO2)
-            return volume_ratio * 1e6
-        elif to_unit == 'percent':
-            # Convert mass ratio to volume ratio (percent)
-            volume_ratio = intermediate * (self.MOLAR_MASS_AIR / self.MOLAR_MASS_CO2)
-            return volume_ratio * 100
-        else:
+        factor = self._CONV.get((from_unit, to_unit))
+        if factor is None:
+            if from_unit not in self._KGKG_PER_UNIT:
+                raise ValueError(f"Unsupported source unit: {from_unit}")
             raise ValueError(f"Unsupported target unit: {to_unit}")
+        return value * factor
 
-    def create_state(self, baseline_co2: float) -> 'CDRAState':
+    def create_state(self, baseline_co2: float, max_steps: int = 0) -> 'CDRAState':
         """
         Create a new CDRA simulation state.
-        
+
         Args:
             baseline_co2: Initial CO2 concentration in kg/kg air
-            
+            max_steps: Number of simulation steps to preallocate history for
+
         Returns:
             CDRAState object
         """
-        return CDRAState(baseline_co2)
+        return CDRAState(baseline_co2, max_steps=max_steps)
 
     def apply_failures(self, state: 'CDRAState', t: int, cfg: Dict) -> None:
         """
@@ -156,14 +161,13 @@ class CDRASimulator:
         fs_end = cfg.get('filter_saturation_end')
 
         if fs_on and fs_start <= t <= fs_end:
-            for comp in state.saturation:
-                state.saturation[comp] = 1.0
-                state.adsorption_eff[comp] = self.BASE_ADSORPTION_EFF + self.MAX_ADSORPTION_EFF_INCREMENT * 1.0
+            state.saturation[:] = 1.0
+            state.adsorption_eff[:] = self.BASE_ADSORPTION_EFF + self.MAX_ADSORPTION_EFF_INCREMENT * 1.0
 
         # --- Heater Failure Handling ---
         heater_failures = cfg.get('heater_failure', []) or []
         for h in heater_failures:
-            state.heater_on[h] = False
+            state.heater_on[COMPONENT_INDEX[h]] = False
 
         # --- Fan Degraded Handling ---
         fd_on = bool(cfg.get('fan_degraded', False))
@@ -175,44 +179,40 @@ class CDRASimulator:
         else:
             state.air_flow_rate = self.AIR_FLOW_RATE_NOMINAL
 
-    def update_filter(self, state: 'CDRAState', component: str, dt: int) -> None:
+    def update_filters(self, state: 'CDRAState', dt: int) -> None:
         """
-        Update filter saturation and efficiency for a component.
-        
+        Update filter saturation and efficiency for all four components at once.
+
+        Heated components regenerate (saturation decreases) while unheated
+        components load up; the update is a single vectorized expression over
+        the 4-element state arrays.
+
         Args:
             state: CDRA simulation state
-            component: Component name
             dt: Time step duration
         """
-        if state.heater_on[component]:
-            state.saturation[component] = max(state.saturation[component] - (2.0 * dt) / self.SATURATION_TIME_CONSTANT, 0.0)
-        else:
-            state.saturation[component] = min(state.saturation[component] + dt / self.SATURATION_TIME_CONSTANT, 1.0)
-        state.adsorption_eff[component] = self.BASE_ADSORPTION_EFF + self.MAX_ADSORPTION_EFF_INCREMENT * (1 - state.saturation[component])
+        delta = np.where(state.heater_on, -self.REGENERATION_RATE_MULTIPLIER, 1.0) * dt / self.SATURATION_TIME_CONSTANT
+        np.clip(state.saturation + delta, 0.0, 1.0, out=state.saturation)
+        state.adsorption_eff[:] = self.BASE_ADSORPTION_EFF + self.MAX_ADSORPTION_EFF_INCREMENT * (1 - state.saturation)
 
     def timestep(self, state: 'CDRAState', dt: int) -> Tuple[float, float]:
         """
         Calculate one simulation timestep.
-        
+
         Args:
             state: CDRA simulation state
             dt: Time step duration
-            
+
         Returns:
             Tuple of (CO2_out, air_flow_rate)
         """
         # Update both paths
-        self.update_filter(state, 'desiccant_1', dt)
-        self.update_filter(state, 'sorbent_2', dt)
-        self.update_filter(state, 'desiccant_3', dt)
-        self.update_filter(state, 'sorbent_4', dt)
-
-        # Choose path efficiency
-        active_path = state.valve_state['path_1_active']
-        if active_path:
-            eta_co2 = state.adsorption_eff['sorbent_2'] if not state.heater_on['sorbent_2'] else -self.DESORPTION_MULTIPLIER
-        else:
-            eta_co2 = state.adsorption_eff['sorbent_4'] if not state.heater_on['sorbent_4'] else -self.DESORPTION_MULTIPLIER
+        self.update_filters(state, dt)
+
+        # Choose path efficiency: the active path only decides which sorbent
+        # index to read, so the duplicated branch bodies reduce to one lookup.
+        s_idx = S2 if state.path_1_active else S4
+        eta_co2 = -self.DESORPTION_MULTIPLIER if state.heater_on[s_idx] else state.adsorption_eff[s_idx]
 
         C_in = state.co2_content
         C_out = C_in * (1 - eta_co2) if eta_co2 >= 0 else C_in * eta_co2
@@ -230,39 +230,82 @@ class CDRASimulator:
         """
         state.co2_content = ((1 - flow / self.M_CABIN) * state.co2_content + (flow / self.M_CABIN) * C_out + self.CO2_INPUT_MEAN / self.M_CABIN)
 
-    def control(self, state: 'CDRAState', failure_config: Dict = None) -> None:
+    def control(self, state: 'CDRAState', failure_config: Dict = None,
+                toggle: Optional[bool] = None,
+                failed_mask: Optional[np.ndarray] = None) -> None:
         """
         Apply control logic to the CDRA system.
-        
+
         Args:
             state: CDRA simulation state
             failure_config: Optional failure configuration
+            toggle: Precomputed valve-toggle decision for this step. If None,
+                the decision is derived from state.time and the failure config.
+            failed_mask: Precomputed boolean mask over COMPONENTS marking
+                failed heaters. If None, the mask is rebuilt from the failure
+                config.
         """
         # --- Valve Control Handling with failure awareness ---
-        valve_stuck = False
-        if failure_config:
-            valve_failure = failure_config.get('valve_stuck')
-            vs_start = failure_config.get('valve_stuck_start')
-            vs_end = failure_config.get('valve_stuck_end')
-            valve_stuck = valve_failure and vs_start <= state.time <= vs_end
-        
-        if not valve_stuck and state.time % self.VALVE_SWITCH_INTERVAL == 0 and state.time != 0:
-            state.valve_state['path_1_active'] = not state.valve_state['path_1_active']
-        
+        if toggle is None:
+            valve_stuck = False
+            if failure_config:
+                valve_failure = failure_config.get('valve_stuck')
+                vs_start = failure_config.get('valve_stuck_start')
+                vs_end = failure_config.get('valve_stuck_end')
+                valve_stuck = valve_failure and vs_start <= state.time <= vs_end
+            toggle = (not valve_stuck and state.time % self.VALVE_SWITCH_INTERVAL == 0
+                      and state.time != 0)
+
+        if toggle:
+            state.path_1_active = not state.path_1_active
+
         # --- Heater Control Handling with failure awareness ---
-        failed_heaters = set()
-        if failure_config:
-            failed_heaters = set(failure_config.get('heater_failure', []))
-        
+        if failed_mask is None:
+            failed_mask = self._build_heater_failure_mask(failure_config)
+
         # Only set heater states for heaters that are not failed
-        if 'desiccant_1' not in failed_heaters:
-            state.heater_on['desiccant_1'] = not state.valve_state['path_1_active']
-        if 'desiccant_3' not in failed_heaters:
-            state.heater_on['desiccant_3'] = state.valve_state['path_1_active']
-        if 'sorbent_2' not in failed_heaters:
-            state.heater_on['sorbent_2'] = not state.valve_state['path_1_active']
-        if 'sorbent_4' not in failed_heaters:
-            state.heater_on['sorbent_4'] = state.valve_state['path_1_active']
+        desired = np.empty(len(COMPONENTS), dtype=np.bool_)
+        desired[D1] = desired[S2] = not state.path_1_active
+        desired[D3] = desired[S4] = state.path_1_active
+        state.heater_on[:] = np.where(failed_mask, state.heater_on, desired)
+
+    @staticmethod
+    def _build_heater_failure_mask(failure_config: Optional[Dict]) -> np.ndarray:
+        """
+        Build a boolean mask over COMPONENTS marking failed heaters.
+
+        Args:
+            failure_config: Optional failure configuration
+
+        Returns:
+            Boolean array, True where the component's heater has failed
+        """
+        mask = np.zeros(len(COMPONENTS), dtype=np.bool_)
+        if failure_config:
+            for name in failure_config.get('heater_failure', []) or []:
+                mask[COMPONENT_INDEX[name]] = True
+        return mask
+
+    def _build_valve_toggle_schedule(self, failure_config: Dict, steps: int, dt: int) -> np.ndarray:
+        """
+        Precompute the per-step valve toggle decisions for a simulation run.
+
+        Args:
+            failure_config: Failure configuration dictionary
+            steps: Number of simulation steps
+            dt: Time step duration
+
+        Returns:
+            Boolean array of length steps; True where the valve toggles
+        """
+        toggle = np.zeros(steps, dtype=np.bool_)
+        interval = self.VALVE_SWITCH_INTERVAL // dt
+        toggle[interval::interval] = True
+        if failure_config and failure_config.get('valve_stuck'):
+            vs_start = failure_config.get('valve_stuck_start', 0)
+            vs_end = failure_config.get('valve_stuck_end', 0)
+            toggle[max(int(vs_start), 0):int(vs_end) + 1] = False
+        return toggle
 
     def run_simulation(
         self,
@@ -286,36 +329,124 @@ class CDRASimulator:
 
         # Convert input from mmHg to kg/kg air for internal simulation
         baseline_co2_kg_per_kg = self.mmhg_to_kg_per_kg_air(baseline_co2_mmHg)
-        
-        state = self.create_state(baseline_co2=baseline_co2_kg_per_kg)
+
+        state = self.create_state(baseline_co2=baseline_co2_kg_per_kg, max_steps=steps)
         self.state = state
+        history = state.history
 
-        for step in range(steps):
-            # Activate failures after onset
-            active_cfg = dict(failure_config)
-            
-            # Basic control (now with failure awareness)
-            self.control(state, active_cfg)
-            self.apply_failures(state, state.time, active_cfg)
-            C_out, flow = self.timestep(state, dt)
-            self.update_cabin_concentration(state, C_out, flow)
-            state.time += dt
-
-            # Update history for plotting
-            for k in state.saturation:
-                state.history['saturation'][k].append(state.saturation[k])
-                state.history['adsorption_eff'][k].append(state.adsorption_eff[k])
-            state.history['time'].append(state.time)
-            state.history['co2_content'].append(state.co2_content)
-            state.history['co2_output'].append(C_out)  # Store CO2 concentration out of CDRA
-            state.history['air_flow_rate'].append(state.air_flow_rate)
-            state.history['desiccant_heaters'].append((state.heater_on['desiccant_1'], state.heater_on['desiccant_3']))
-            state.history['sorbent_heaters'].append((state.heater_on['sorbent_2'], state.heater_on['sorbent_4']))
-            state.history['active_path'].append(state.valve_state['path_1_active'])
-            state.history['desiccant_1_heater'].append(int(state.heater_on['desiccant_1']))
-            state.history['desiccant_3_heater'].append(int(state.heater_on['desiccant_3']))
-            state.history['sorbent_2_heater'].append(int(state.heater_on['sorbent_2']))
-            state.history['sorbent_4_heater'].append(int(state.heater_on['sorbent_4']))
+        # The valve toggle schedule is fully deterministic once the
+        # valve-stuck window is known, so precompute it instead of testing
+        # the modulo condition on every step.
+        valve_toggle = self._build_valve_toggle_schedule(failure_config, steps, dt)
+
+        # Read the failure configuration once into plain scalars; the dict
+        # never changes during a run, so per-step dict probing is wasted work.
+        cfg = dict(failure_config)
+        fs_on = bool(cfg.get('filter_saturation'))
+        fs_start = cfg.get('filter_saturation_start')
+        fs_end = cfg.get('filter_saturation_end')
+        fd_on = bool(cfg.get('fan_degraded', False))
+        fd_start = cfg.get('fan_degraded_start')
+        fd_end = cfg.get('fan_degraded_end')
+        degraded_flow = cfg.get('degraded_flow_rate')
+        heater_failed = self._build_heater_failure_mask(cfg)
+        any_heater_failed = bool(heater_failed.any())
+
+        # Between control/failure events the system is linear: heater states,
+        # active path, air flow, and the filter-saturation override are all
+        # constant, so each segment can be evolved in closed form with
+        # vectorized NumPy instead of a Python-level per-step loop.
+        # Segment boundaries: valve toggles plus the edges of the failure
+        # windows (and a length cap to keep the cumprod below well scaled).
+        bounds = {0, steps}
+        bounds.update(int(i) for i in np.flatnonzero(valve_toggle))
+        if fs_on:
+            bounds.add(min(max(int(fs_start), 0), steps))
+            bounds.add(min(max(int(fs_end) + 1, 0), steps))
+        if fd_on:
+            bounds.add(min(max(int(fd_start), 0), steps))
+            bounds.add(min(max(int(fd_end) + 1, 0), steps))
+        bounds.update(range(0, steps, 4096))
+        bounds = sorted(bounds)
+
+        tau = self.SATURATION_TIME_CONSTANT
+        k_input = self.CO2_INPUT_MEAN / self.M_CABIN
+        path_1 = state.path_1_active
+        co2 = state.co2_content
+        sat = state.saturation.copy()
+        heater = state.heater_on.copy()
+        eff_last = state.adsorption_eff.copy()
+        flow = state.air_flow_rate
+
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            if valve_toggle[a]:
+                path_1 = not path_1
+
+            # Heater control for the whole segment (failed heaters stay off)
+            heater = np.empty(len(COMPONENTS), dtype=np.bool_)
+            heater[D1] = heater[S2] = not path_1
+            heater[D3] = heater[S4] = path_1
+            if any_heater_failed:
+                heater[heater_failed] = False
+
+            fs_active = fs_on and fs_start <= a <= fs_end
+            if fd_on and fd_start <= a <= fd_end:
+                flow = degraded_flow
+            else:
+                flow = self.AIR_FLOW_RATE_NOMINAL
+
+            length = b - a
+            delta = np.where(heater, -self.REGENERATION_RATE_MULTIPLIER, 1.0) * dt / tau
+            if fs_active:
+                # Saturation is pinned to 1.0 before every update, so the
+                # post-update values are the same on every step of the segment.
+                sat_mat = np.broadcast_to(np.clip(1.0 + delta, 0.0, 1.0), (length, len(COMPONENTS)))
+            else:
+                # Monotonic linear ramp per component; the clip reproduces the
+                # per-step clamp exactly.
+                ramp = np.arange(1, length + 1)[:, None]
+                sat_mat = np.clip(sat + delta * ramp, 0.0, 1.0)
+            eff_mat = self.BASE_ADSORPTION_EFF + self.MAX_ADSORPTION_EFF_INCREMENT * (1.0 - sat_mat)
+
+            # C_out = C * factor, with factor = (1 - eta) for adsorption and
+            # eta (= -DESORPTION_MULTIPLIER) while the active sorbent desorbs.
+            s_idx = S2 if path_1 else S4
+            if heater[s_idx]:
+                factor = np.full(length, -self.DESORPTION_MULTIPLIER)
+            else:
+                factor = 1.0 - eff_mat[:, s_idx]
+
+            # Cabin recurrence C[i+1] = A[i]*C[i] + k solved in closed form:
+            # C[m] = P[m]*(C0 + k*sum(1/P[:m])) with P = cumprod(A).
+            f_frac = flow / self.M_CABIN
+            A = 1.0 - f_frac * (1.0 - factor)
+            P = np.cumprod(A)
+            co2_post = P * (co2 + k_input * np.cumsum(1.0 / P))
+            co2_pre = np.empty(length)
+            co2_pre[0] = co2
+            co2_pre[1:] = co2_post[:-1]
+
+            history['saturation'][a:b] = sat_mat
+            history['adsorption_eff'][a:b] = eff_mat
+            history['time'][a:b] = np.arange(a + 1, b + 1) * dt
+            history['co2_content'][a:b] = co2_post
+            history['co2_output'][a:b] = co2_pre * factor
+            history['air_flow_rate'][a:b] = flow
+            history['heater'][a:b] = heater
+            history['active_path'][a:b] = path_1
+
+            co2 = float(co2_post[-1])
+            sat = np.asarray(sat_mat[-1], dtype=np.float64).copy()
+            eff_last = np.asarray(eff_mat[-1], dtype=np.float64).copy()
+
+        # Leave the scalar state exactly where the per-step loop would have
+        state.saturation[:] = sat
+        state.adsorption_eff[:] = eff_last
+        state.heater_on[:] = heater
+        state.path_1_active = path_1
+        state.co2_content = co2
+        state.air_flow_rate = flow
+        state.time = steps * dt
 
         return state
 
@@ -336,41 +467,15 @@ class CDRASimulator:
             return list(values)
         if len(values) == 0:
             return [0.0] * target_len
-        
-        # Handle case where target length is larger than input length
-        if target_len > len(values):
-            # Interpolate between existing points to increase density across the full span
-            if len(values) == 1:
-                # If only one value, repeat it (edge case)
-                return [values[0]] * target_len
-            else:
-                # Create a denser interpolation across the full range
-                result = []
-                for i in range(target_len):
-                    # Map target index to original data range
-                    # This ensures we cover the full span from first to last value
-                    pos = i * (len(values) - 1) / (target_len - 1)
-                    lo = int(math.floor(pos))
-                    hi = min(lo + 1, len(values) - 1)
-                    frac = pos - lo
-                    
-                    # Linear interpolation between consecutive points
-                    v = values[lo] * (1 - frac) + values[hi] * frac
-                    result.append(v)
-                
-                return result
-        
-        # Original case: target length is smaller than or equal to input length
-        # Linear resample
-        result: List[float] = []
-        for i in range(target_len):
-            pos = i * (len(values) - 1) / (target_len - 1)
-            lo = int(math.floor(pos))
-            hi = min(lo + 1, len(values) - 1)
-            frac = pos - lo
-            v = values[lo] * (1 - frac) + values[hi] * frac
-            result.append(v)
-        return result
+        if len(values) == 1:
+            # If only one value, repeat it (edge case)
+            return [values[0]] * target_len
+
+        # Linear interpolation over a normalized axis covering the full span
+        # from first to last value, done in one C pass by np.interp.
+        x = np.linspace(0.0, 1.0, target_len)
+        xp = np.linspace(0.0, 1.0, len(values))
+        return np.interp(x, xp, np.asarray(values, dtype=np.float64)).tolist()
 
     def anomaly_to_failure_config(self, anomaly_name: str, severity: float) -> Dict:
         """
@@ -383,7 +488,8 @@ class CDRASimulator:
         Returns:
             Failure configuration dictionary
         """
-        print(f"[ANOMALY_CFG] Converting anomaly '{anomaly_name}' with severity {severity:.3f}")
+        logger.debug("[ANOMALY_CFG] Converting anomaly '%s' with severity %.3f",
+                     anomaly_name, severity)
         
         # Map common CDRA anomaly names to failure config
         name = anomaly_name.lower()
@@ -401,27 +507,27 @@ class CDRASimulator:
             'degraded_flow_rate': max(0.1, self.AIR_FLOW_RATE_NOMINAL * (1 - severity)),
         }
         
-        print(f"[ANOMALY_CFG] Checking name '{name}' against patterns...")
+        logger.debug("[ANOMALY_CFG] Checking name '%s' against patterns...", name)
         
         if 'saturat' in name or 'absorption bed' in name or 'filter' in name:
             cfg['filter_saturation'] = True
-            print(f"[ANOMALY_CFG] MATCH: 'saturat' or 'absorption bed' or 'filter' -> filter_saturation=True, onset={cfg['filter_saturation_start']}")
+            logger.debug("[ANOMALY_CFG] MATCH: 'saturat' or 'absorption bed' or 'filter' -> filter_saturation=True, onset=%s", cfg['filter_saturation_start'])
         
         if 'valve' in name or 'leak' in name:
             cfg['valve_stuck'] = True
-            print(f"[ANOMALY_CFG] MATCH: 'valve' or 'leak' -> valve_stuck=True, onset={cfg['valve_stuck_start']}")
+            logger.debug("[ANOMALY_CFG] MATCH: 'valve' or 'leak' -> valve_stuck=True, onset=%s", cfg['valve_stuck_start'])
         if 'heater' in name:
             cfg['heater_failure'] = ['desiccant_1', 'sorbent_2']
-            print(f"[ANOMALY_CFG] MATCH: 'heater' -> heater_failure={cfg['heater_failure']}")
+            logger.debug("[ANOMALY_CFG] MATCH: 'heater' -> heater_failure=%s", cfg['heater_failure'])
         if 'fan' in name or 'bearing' in name:
             cfg['fan_degraded'] = True
-            print(f"[ANOMALY_CFG] MATCH: 'fan' or 'bearing' -> fan_degraded=True, onset={cfg['fan_degraded_start']}, flow_rate={cfg['degraded_flow_rate']:.3f}")
+            logger.debug("[ANOMALY_CFG] MATCH: 'fan' or 'bearing' -> fan_degraded=True, onset=%s, flow_rate=%.3f", cfg['fan_degraded_start'], cfg['degraded_flow_rate'])
         if 'sensor drift' in name or 'drift' in name:
-            print(f"[ANOMALY_CFG] MATCH: 'sensor drift' or 'drift' -> handled in caller by post-process drift")
+            logger.debug("[ANOMALY_CFG] MATCH: 'sensor drift' or 'drift' -> handled in caller by post-process drift")
             # handled in caller by post-process drift
             pass
         
-        print(f"[ANOMALY_CFG] ---")
+        logger.debug("[ANOMALY_CFG] ---")
         return cfg
 
     def get_co2_time_series_mmhg(self) -> List[float]:
@@ -433,8 +539,9 @@ class CDRASimulator:
         """
         if self.state is None:
             return []
-        
-        return [self.kg_per_kg_air_to_mmhg(co2) for co2 in self.state.history['co2_content']]
+
+        return (np.asarray(self.state.history['co2_content'], dtype=np.float64)
+                * self.KGKG_TO_MMHG).tolist()
 
     def get_simulation_summary(self) -> Dict:
         """
@@ -493,17 +600,36 @@ class CDRASimulator:
         # Create and return telemetry data object
         return CDRATelemetryData(state, scenario, severity)
 
-    def get_co2_time_series_mmhg(self) -> List[float]:
+    def generate_telemetry_batch(
+        self,
+        requests: List[Dict],
+        max_workers: Optional[int] = None
+    ) -> List['CDRATelemetryData']:
         """
-        Get CO2 time series in mmHg units.
-        
+        Generate telemetry data for a batch of independent scenarios.
+
+        Each entry in requests is a dict of generate_telemetry_data keyword
+        arguments (scenario, severity, duration_seconds, baseline_co2_mmHg).
+        The simulations share no state, so with max_workers > 1 they are
+        spread across worker processes; by default the batch runs
+        sequentially, which is usually fastest for the vectorized simulator
+        unless the batch is large.
+
+        Args:
+            requests: List of keyword-argument dicts, one per simulation
+            max_workers: Number of worker processes (None or 1 = sequential)
+
         Returns:
-            List of CO2 concentrations in mmHg
+            List of CDRATelemetryData objects in request order
         """
-        if self.state is None:
-            return []
-        
-        return [self.kg_per_kg_air_to_mmhg(co2) for co2 in self.state.history['co2_content']]
+        requests = list(requests)
+        if max_workers is None or max_workers <= 1 or len(requests) <= 1:
+            return [self.generate_telemetry_data(**req) for req in requests]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(self.generate_telemetry_data, **req)
+                       for req in requests]
+            return [f.result() for f in futures]
 
 
 class CDRATelemetryData:
@@ -527,54 +653,58 @@ class CDRATelemetryData:
         self.scenario = scenario
         self.severity = severity
         self._co2_series_mmhg = None
+        self._co2_output_mmhg = None
         self._time_series = None
         
-    def get_co2_time_series_mmhg(self) -> List[float]:
+    def get_co2_time_series_mmhg(self) -> np.ndarray:
         """
         Get CO2 time series in mmHg units.
-        
+
         Returns:
-            List of CO2 concentrations in mmHg
+            Array of CO2 concentrations in mmHg (cached; treat as read-only)
         """
         if self._co2_series_mmhg is None:
-            self._co2_series_mmhg = [
-                self._kg_per_kg_air_to_mmhg(co2) for co2 in self.state.history['co2_content']
-            ]
+            self._co2_series_mmhg = (
+                np.asarray(self.state.history['co2_content'], dtype=np.float64)
+                * CDRASimulator.KGKG_TO_MMHG
+            )
         return self._co2_series_mmhg
     
-    def get_time_series(self) -> List[float]:
+    def get_time_series(self) -> np.ndarray:
         """
         Get time series in seconds.
-        
+
         Returns:
-            List of time values in seconds
+            Array of time values in seconds (view into history; read-only)
         """
         if self._time_series is None:
-            self._time_series = self.state.history['time'].copy()
+            self._time_series = self.state.history['time']
         return self._time_series
     
-    def get_air_flow_rate_series(self) -> List[float]:
+    def get_air_flow_rate_series(self) -> np.ndarray:
         """
         Get air flow rate time series.
         
         Returns:
-            List of air flow rates
+            Array of air flow rates (view into history; read-only)
         """
-        return self.state.history['air_flow_rate'].copy()
+        return self.state.history['air_flow_rate']
     
-    def get_co2_output_series_mmhg(self) -> List[float]:
+    def get_co2_output_series_mmhg(self) -> np.ndarray:
         """
         Get CO2 output concentration time series in mmHg units.
-        
+
         Returns:
-            List of CO2 output concentrations in mmHg
+            Array of CO2 output concentrations in mmHg (cached; read-only)
         """
-        if self.state is None:
-            return []
-        
-        return [self._kg_per_kg_air_to_mmhg(co2) for co2 in self.state.history['co2_output']]
+        if self._co2_output_mmhg is None:
+            self._co2_output_mmhg = (
+                np.asarray(self.state.history['co2_output'], dtype=np.float64)
+                * CDRASimulator.KGKG_TO_MMHG
+            )
+        return self._co2_output_mmhg
     
-    def get_saturation_series(self, component: str) -> List[float]:
+    def get_saturation_series(self, component: str) -> np.ndarray:
         """
         Get saturation time series for a specific component.
         
@@ -582,11 +712,11 @@ class CDRATelemetryData:
             component: Component name ('desiccant_1', 'desiccant_3', 'sorbent_2', 'sorbent_4')
             
         Returns:
-            List of saturation values
+            Array of saturation values (view into history; read-only)
         """
-        return self.state.history['saturation'][component].copy()
+        return self.state.history['saturation'][:, COMPONENT_INDEX[component]]
     
-    def get_adsorption_efficiency_series(self, component: str) -> List[float]:
+    def get_adsorption_efficiency_series(self, component: str) -> np.ndarray:
         """
         Get adsorption efficiency time series for a specific component.
         
@@ -594,11 +724,11 @@ class CDRATelemetryData:
             component: Component name ('desiccant_1', 'desiccant_3', 'sorbent_2', 'sorbent_4')
             
         Returns:
-            List of adsorption efficiency values
+            Array of adsorption efficiency values (view into history; read-only)
         """
-        return self.state.history['adsorption_eff'][component].copy()
+        return self.state.history['adsorption_eff'][:, COMPONENT_INDEX[component]]
     
-    def get_heater_states(self, component: str) -> List[int]:
+    def get_heater_states(self, component: str) -> np.ndarray:
         """
         Get heater state time series for a specific component.
         
@@ -606,18 +736,29 @@ class CDRATelemetryData:
             component: Component name ('desiccant_1', 'desiccant_3', 'sorbent_2', 'sorbent_4')
             
         Returns:
-            List of heater states (0=off, 1=on)
+            Array of heater states (0=off, 1=on; view into history, read-only)
         """
-        return self.state.history[f'{component}_heater'].copy()
+        return self.state.history['heater'][:, COMPONENT_INDEX[component]]
     
-    def get_active_path_series(self) -> List[bool]:
+    def get_heater_states_matrix(self) -> np.ndarray:
+        """
+        Get heater states for all four components as one matrix.
+
+        Returns:
+            (4, N) uint8 matrix with rows in COMPONENTS order (view into
+            history; read-only)
+        """
+        return self.state.history['heater'].T
+
+    def get_active_path_series(self) -> np.ndarray:
         """
         Get active path time series.
         
         Returns:
-            List of active path states (True=path_1, False=path_2)
+            Array of active path states (True=path_1, False=path_2; view into
+            history, read-only)
         """
-        return self.state.history['active_path'].copy()
+        return self.state.history['active_path']
     
     def find_detection_index(self, trigger: float) -> int:
         """
@@ -630,10 +771,10 @@ class CDRATelemetryData:
             Index of first detection, or -1 if not found
         """
         co2_series = self.get_co2_time_series_mmhg()
-        for i, co2 in enumerate(co2_series):
-            if co2 > trigger:
-                return i
-        return -1
+        if len(co2_series) == 0:
+            return -1
+        idx = int(np.argmax(co2_series > trigger))
+        return idx if co2_series[idx] > trigger else -1
     
     def get_peak_co2(self) -> float:
         """
@@ -643,7 +784,7 @@ class CDRATelemetryData:
             Peak CO2 concentration in mmHg
         """
         co2_series = self.get_co2_time_series_mmhg()
-        return max(co2_series) if co2_series else 0.0
+        return float(co2_series.max()) if len(co2_series) else 0.0
     
     def get_final_co2(self) -> float:
         """
@@ -653,7 +794,7 @@ class CDRATelemetryData:
             Final CO2 concentration in mmHg
         """
         co2_series = self.get_co2_time_series_mmhg()
-        return co2_series[-1] if co2_series else 0.0
+        return float(co2_series[-1]) if len(co2_series) else 0.0
     
     def get_average_co2(self) -> float:
         """
@@ -663,8 +804,31 @@ class CDRATelemetryData:
             Average CO2 concentration in mmHg
         """
         co2_series = self.get_co2_time_series_mmhg()
-        return sum(co2_series) / len(co2_series) if co2_series else 0.0
-    
+        return float(co2_series.mean()) if len(co2_series) else 0.0
+
+    def summarize(self, detection_threshold: float = 4.0) -> Tuple[float, float, float, int]:
+        """
+        Compute peak, final, and average CO2 plus the detection index together.
+
+        Fetches the memoized CO2 array once instead of once per metric, for
+        callers (like plot_analysis_summary) that need all four values.
+
+        Args:
+            detection_threshold: CO2 threshold in mmHg for detection
+
+        Returns:
+            Tuple of (peak_co2, final_co2, avg_co2, detection_idx); the
+            detection index is -1 when the threshold is never crossed
+        """
+        co2_series = self.get_co2_time_series_mmhg()
+        if len(co2_series) == 0:
+            return 0.0, 0.0, 0.0, -1
+        detection_idx = int(np.argmax(co2_series > detection_threshold))
+        if co2_series[detection_idx] <= detection_threshold:
+            detection_idx = -1
+        return (float(co2_series.max()), float(co2_series[-1]),
+                float(co2_series.mean()), detection_idx)
+
     def resample_to_length(self, target_length: int) -> 'CDRATelemetryData':
         """
         Create a resampled version of this telemetry data.
@@ -676,68 +840,47 @@ class CDRATelemetryData:
             New CDRATelemetryData with resampled data
         """
         # Create a new state with resampled data
-        new_state = CDRAState(self.state.co2_content)
-        
+        new_state = CDRAState(self.state.co2_content, max_steps=target_length)
+
         # Resample all time series
         co2_series = self.get_co2_time_series_mmhg()
         resampled_co2 = self._resample_series(co2_series, target_length)
-        
+
         # Convert back to kg/kg air for internal representation
-        resampled_co2_kg_per_kg = [
-            self._mmhg_to_kg_per_kg_air(co2) for co2 in resampled_co2
-        ]
-        
-        # Update the new state's history
-        new_state.history['co2_content'] = resampled_co2_kg_per_kg
-        new_state.history['time'] = list(range(len(resampled_co2)))
-        
+        new_state.history['co2_content'][:] = (
+            np.asarray(resampled_co2, dtype=np.float64) * CDRASimulator.MMHG_TO_KGKG
+        )
+        new_state.history['time'][:] = np.arange(len(resampled_co2))
+
         # Resample other series if needed
-        for component in ['desiccant_1', 'desiccant_3', 'sorbent_2', 'sorbent_4']:
-            new_state.history['saturation'][component] = self._resample_series(
+        for component, idx in COMPONENT_INDEX.items():
+            new_state.history['saturation'][:, idx] = self._resample_series(
                 self.get_saturation_series(component), target_length
             )
-            new_state.history['adsorption_eff'][component] = self._resample_series(
+            new_state.history['adsorption_eff'][:, idx] = self._resample_series(
                 self.get_adsorption_efficiency_series(component), target_length
             )
-        
-        new_state.history['air_flow_rate'] = self._resample_series(
+
+        new_state.history['air_flow_rate'][:] = self._resample_series(
             self.get_air_flow_rate_series(), target_length
         )
-        
+
         return CDRATelemetryData(new_state, self.scenario, self.severity)
     
     def _resample_series(self, values: List[float], target_len: int) -> List[float]:
-        """Helper method for resampling time series."""
+        """Helper method for resampling time series (linear, via np.interp)."""
         if target_len <= 0:
             return []
         if len(values) == target_len:
             return list(values)
         if len(values) == 0:
             return [0.0] * target_len
-        
-        if target_len > len(values):
-            if len(values) == 1:
-                return [values[0]] * target_len
-            else:
-                result = []
-                for i in range(target_len):
-                    pos = i * (len(values) - 1) / (target_len - 1)
-                    lo = int(math.floor(pos))
-                    hi = min(lo + 1, len(values) - 1)
-                    frac = pos - lo
-                    v = values[lo] * (1 - frac) + values[hi] * frac
-                    result.append(v)
-                return result
-        
-        result = []
-        for i in range(target_len):
-            pos = i * (len(values) - 1) / (target_len - 1)
-            lo = int(math.floor(pos))
-            hi = min(lo + 1, len(values) - 1)
-            frac = pos - lo
-            v = values[lo] * (1 - frac) + values[hi] * frac
-            result.append(v)
-        return result
+        if len(values) == 1:
+            return [values[0]] * target_len
+
+        x = np.linspace(0.0, 1.0, target_len)
+        xp = np.linspace(0.0, 1.0, len(values))
+        return np.interp(x, xp, np.asarray(values, dtype=np.float64)).tolist()
 
     ### telemetry data methods ###
     def get_summary(self) -> Dict:
@@ -749,33 +892,52 @@ class CDRATelemetryData:
         """
         co2_series = self.get_co2_time_series_mmhg()
         time_series = self.get_time_series()
-        
+        n = len(co2_series)
+
         return {
             'scenario': self.scenario,
             'severity': self.severity,
-            'duration_seconds': time_series[-1] if time_series else 0,
-            'total_timesteps': len(co2_series),
-            'initial_co2_mmhg': co2_series[0] if co2_series else 0.0,
-            'final_co2_mmhg': co2_series[-1] if co2_series else 0.0,
-            'peak_co2_mmhg': max(co2_series) if co2_series else 0.0,
-            'min_co2_mmhg': min(co2_series) if co2_series else 0.0,
-            'avg_co2_mmhg': sum(co2_series) / len(co2_series) if co2_series else 0.0,
+            'duration_seconds': float(time_series[-1]) if len(time_series) else 0,
+            'total_timesteps': n,
+            'initial_co2_mmhg': float(co2_series[0]) if n else 0.0,
+            'final_co2_mmhg': float(co2_series[-1]) if n else 0.0,
+            'peak_co2_mmhg': float(co2_series.max()) if n else 0.0,
+            'min_co2_mmhg': float(co2_series.min()) if n else 0.0,
+            'avg_co2_mmhg': float(co2_series.mean()) if n else 0.0,
         }
     
     def _kg_per_kg_air_to_mmhg(self, co2_kg_per_kg_air: float) -> float:
         """Helper method for unit conversion."""
-        co2_mol_per_mol_air = co2_kg_per_kg_air * (28.97 / 44.01)
-        co2_pa = co2_mol_per_mol_air * (760.0 * 133.322)
-        return co2_pa / 133.322
+        return co2_kg_per_kg_air * CDRASimulator.KGKG_TO_MMHG
     
     def _mmhg_to_kg_per_kg_air(self, co2_mmhg: float) -> float:
         """Helper method for unit conversion."""
-        co2_pa = co2_mmhg * 133.322
-        co2_mol_per_mol_air = co2_pa / (760.0 * 133.322)
-        return co2_mol_per_mol_air * (44.01 / 28.97)
+        return co2_mmhg * CDRASimulator.MMHG_TO_KGKG
     
 
     ### plotting functions ###
+    @staticmethod
+    def _downsample(x, y, max_points: int = 2000):
+        """
+        Stride-downsample a (time, value) pair for plotting.
+
+        Long scenarios produce far more samples than a figure has pixels;
+        drawing them all just slows matplotlib down. Returns the inputs
+        unchanged when they already fit within max_points.
+
+        Args:
+            x: Time values
+            y: Data values (same length as x)
+            max_points: Maximum number of points to keep
+
+        Returns:
+            Tuple of (x, y) strided to at most ~max_points samples
+        """
+        stride = max(1, len(x) // max_points)
+        if stride == 1:
+            return x, y
+        return x[::stride], y[::stride]
+
     def plot_co2_concentration(self, figsize: Tuple[int, int] = (12, 8), 
                               title: str = None, show_detection: bool = True,
                               detection_threshold: float = 4.0) -> None:
@@ -791,25 +953,25 @@ class CDRATelemetryData:
         co2_series = self.get_co2_time_series_mmhg()
         time_series = self.get_time_series()
         
-        plt.figure(figsize=figsize)
-        plt.plot(time_series, co2_series, linewidth=2, color=get_color_by_index(0), label='CO2 Concentration')
-        
+        fig, ax = plt.subplots(figsize=figsize, layout='constrained')
+        ax.plot(*self._downsample(time_series, co2_series), linewidth=2,
+               color=_COLOR_CYCLE[0], label='CO2 Concentration', rasterized=True)
+
         if show_detection:
-            plt.axhline(y=detection_threshold, color=get_color('detection_threshold'), linestyle='--', 
-                       linewidth=2, label=f'Detection Threshold ({detection_threshold} mmHg)')
-            
+            ax.axhline(y=detection_threshold, color=_SEMANTIC_COLORS['detection_threshold'], linestyle='--',
+                      linewidth=2, label=f'Detection Threshold ({detection_threshold} mmHg)')
+
             # Find and mark detection point
             detection_idx = self.find_detection_index(detection_threshold)
             if detection_idx >= 0:
-                plt.axvline(x=time_series[detection_idx], color=get_color('detection_line'), linestyle=':', 
-                           alpha=0.7, label=f'Detection at t={time_series[detection_idx]:.0f}s')
-        
-        plt.xlabel('Time [s]', fontsize=12)
-        plt.ylabel('CO2 Concentration [mmHg]', fontsize=12)
-        plt.title(title or f'CO2 Concentration - {self.scenario} (Severity: {self.severity})', fontsize=14)
-        plt.grid(True, alpha=0.7)
-        plt.legend()
-        plt.tight_layout()
+                ax.axvline(x=time_series[detection_idx], color=_SEMANTIC_COLORS['detection_line'], linestyle=':',
+                          alpha=0.7, label=f'Detection at t={time_series[detection_idx]:.0f}s')
+
+        ax.set_xlabel('Time [s]', fontsize=12)
+        ax.set_ylabel('CO2 Concentration [mmHg]', fontsize=12)
+        ax.set_title(title or f'CO2 Concentration - {self.scenario} (Severity: {self.severity})', fontsize=14)
+        ax.grid(True, alpha=0.7)
+        ax.legend()
         #plt.show()
     
     def plot_component_states(self, figsize: Tuple[int, int] = (15, 10)) -> None:
@@ -822,7 +984,7 @@ class CDRATelemetryData:
         time_series = self.get_time_series()
         components = ['desiccant_1', 'desiccant_3', 'sorbent_2', 'sorbent_4']
         
-        fig, axes = plt.subplots(2, 2, figsize=figsize)
+        fig, axes = plt.subplots(2, 2, figsize=figsize, layout='constrained')
         axes = axes.flatten()
         
         for i, component in enumerate(components):
@@ -830,31 +992,38 @@ class CDRATelemetryData:
             
             # Plot saturation
             saturation = self.get_saturation_series(component)
-            ax.plot(time_series, saturation, linewidth=2, color=get_color_by_index(0), label='Saturation')
-            
+            sat_line, = ax.plot(*self._downsample(time_series, saturation), linewidth=2,
+                               color=_COLOR_CYCLE[0], label='Saturation', rasterized=True)
+
             # Plot efficiency on secondary y-axis
             ax2 = ax.twinx()
             efficiency = self.get_adsorption_efficiency_series(component)
-            ax2.plot(time_series, efficiency, linewidth=2, color=get_color_by_index(1), label='Efficiency')
+            eff_line, = ax2.plot(*self._downsample(time_series, efficiency), linewidth=2,
+                                color=_COLOR_CYCLE[1], label='Efficiency', rasterized=True)
             
-            # Plot heater state
-            heater_states = self.get_heater_states(component)
-            ax.fill_between(time_series, 0, 1, where=heater_states, 
-                           alpha=0.3, color=get_color_by_index(2), label='Heater ON')
+            # Shade heater-ON intervals as run-length spans: a handful of
+            # rectangles instead of a polygon vertex per timestep
+            heater_states = np.asarray(self.get_heater_states(component), dtype=bool)
+            padded = np.concatenate(([False], heater_states, [False]))
+            edges = np.flatnonzero(padded[1:] != padded[:-1])
+            dt = float(time_series[1] - time_series[0]) if len(time_series) > 1 else 1.0
+            xranges = [(time_series[s] - dt, (e - s) * dt)
+                       for s, e in zip(edges[::2], edges[1::2])]
+            heater_span = ax.broken_barh(xranges, (0, 1), alpha=0.3,
+                                        facecolors=_COLOR_CYCLE[2], label='Heater ON')
             
             ax.set_xlabel('Time [s]')
-            ax.set_ylabel('Saturation', color=get_color_by_index(0))
-            ax2.set_ylabel('Efficiency', color=get_color_by_index(1))
+            ax.set_ylabel('Saturation', color=_COLOR_CYCLE[0])
+            ax2.set_ylabel('Efficiency', color=_COLOR_CYCLE[1])
             ax.set_title(f'{component.replace("_", " ").title()}')
             ax.grid(True, alpha=0.7)
             
-            # Combine legends
-            lines1, labels1 = ax.get_legend_handles_labels()
-            lines2, labels2 = ax2.get_legend_handles_labels()
-            ax.legend(lines1 + lines2, labels1 + labels2, loc='upper right')
+            # Combine legends from the handles captured above rather than
+            # walking both artist trees
+            ax.legend([sat_line, eff_line, heater_span],
+                      ['Saturation', 'Efficiency', 'Heater ON'], loc='upper right')
         
-        plt.suptitle(f'Component States - {self.scenario}', fontsize=16)
-        plt.tight_layout()
+        fig.suptitle(f'Component States - {self.scenario}', fontsize=16)
         #plt.show()
     
     def plot_system_overview(self, figsize: Tuple[int, int] = (16, 12)) -> None:
@@ -869,33 +1038,52 @@ class CDRATelemetryData:
         air_flow = self.get_air_flow_rate_series()
         active_path = self.get_active_path_series()
         
-        fig, axes = plt.subplots(4, 1, figsize=figsize)
+        fig, axes = plt.subplots(4, 1, figsize=figsize, layout='constrained')
         
         # CO2 Concentration
-        axes[0].plot(time_series, co2_series, linewidth=2, color=get_color_by_index(0))
+        axes[0].plot(*self._downsample(time_series, co2_series), linewidth=2, color=_COLOR_CYCLE[0], rasterized=True)
         axes[0].set_ylabel('CO2 [mmHg]')
         axes[0].set_title('CO2 Concentration')
         axes[0].grid(True, alpha=0.7)
-        
+
         # Air Flow Rate
-        axes[1].plot(time_series, air_flow, linewidth=2, color=get_color_by_index(1))
+        axes[1].plot(*self._downsample(time_series, air_flow), linewidth=2, color=_COLOR_CYCLE[1], rasterized=True)
         axes[1].set_ylabel('Flow Rate [kg/s]')
         axes[1].set_title('Air Flow Rate')
         axes[1].grid(True, alpha=0.7)
         
-        # Heater States
+        # Heater States: one (4, N) matrix with per-row offsets applied in a
+        # single broadcast, drawn as a single LineCollection instead of four
+        # Line2D artists
         components = ['desiccant_1', 'desiccant_3', 'sorbent_2', 'sorbent_4']
-        for i, component in enumerate(components):
-            heater_states = self.get_heater_states(component)
-            axes[2].plot(time_series, np.array(heater_states) + i*0.1, 
-                        linewidth=2, color=get_color_by_index(i), label=component.replace('_', ' ').title())
+        rows = [COMPONENT_INDEX[c] for c in components]
+        heater_matrix = (
+            self.get_heater_states_matrix()[rows].astype(np.float32)
+            + 0.1 * np.arange(len(rows), dtype=np.float32)[:, None]
+        )
+        heater_time, heater_ds = self._downsample(time_series, heater_matrix.T)
+        heater_colors = [_COLOR_CYCLE[i] for i in range(len(components))]
+        segments = [np.column_stack([heater_time, heater_ds[:, i]])
+                    for i in range(len(components))]
+        axes[2].add_collection(LineCollection(segments, colors=heater_colors, linewidths=2, rasterized=True))
+        axes[2].autoscale_view()
         axes[2].set_ylabel('Heater States')
         axes[2].set_title('Heater Status')
-        axes[2].legend()
+        # Collections carry no per-line legend entries, so use proxy handles
+        axes[2].legend(handles=[Line2D([], [], color=heater_colors[i], linewidth=2,
+                                       label=component.replace('_', ' ').title())
+                                for i, component in enumerate(components)])
         axes[2].grid(True, alpha=0.7)
         
-        # Active Path
-        axes[3].step(time_series, active_path, linewidth=2, color=get_color_by_index(4), where='post')
+        # Active Path: run-length compress before stepping — the path only
+        # toggles a handful of times per scenario, so keep just the samples
+        # where the value changes (plus the endpoints)
+        active_path = np.asarray(active_path)
+        if len(active_path):
+            changes = np.r_[True, active_path[1:] != active_path[:-1]]
+            changes[-1] = True
+            axes[3].step(time_series[changes], active_path[changes], linewidth=2,
+                        color=_COLOR_CYCLE[4], where='post', rasterized=True)
         axes[3].set_ylabel('Active Path')
         axes[3].set_xlabel('Time [s]')
         axes[3].set_title('Valve Path Selection')
@@ -903,8 +1091,7 @@ class CDRATelemetryData:
         axes[3].set_yticklabels(['Path 2', 'Path 1'])
         axes[3].grid(True, alpha=0.7)
         
-        plt.suptitle(f'CDRA System Overview - {self.scenario} (Severity: {self.severity})', fontsize=16)
-        plt.tight_layout()
+        fig.suptitle(f'CDRA System Overview - {self.scenario} (Severity: {self.severity})', fontsize=16)
         #plt.show()
     
     def plot_comparison(self, other_telemetry: 'CDRATelemetryData', 
@@ -920,18 +1107,17 @@ class CDRATelemetryData:
         co2_series_1 = self.get_co2_time_series_mmhg()
         co2_series_2 = other_telemetry.get_co2_time_series_mmhg()
         
-        plt.figure(figsize=figsize)
-        plt.plot(time_series, co2_series_1, linewidth=2, color=get_color_by_index(0), 
-                label=f'{self.scenario} (Severity: {self.severity})')
-        plt.plot(time_series, co2_series_2, linewidth=2, color=get_color_by_index(1), 
-                label=f'{other_telemetry.scenario} (Severity: {other_telemetry.severity})')
-        
-        plt.xlabel('Time [s]', fontsize=12)
-        plt.ylabel('CO2 Concentration [mmHg]', fontsize=12)
-        plt.title('CDRA Telemetry Comparison', fontsize=14)
-        plt.grid(True, alpha=0.7)
-        plt.legend()
-        plt.tight_layout()
+        fig, ax = plt.subplots(figsize=figsize, layout='constrained')
+        ax.plot(*self._downsample(time_series, co2_series_1), linewidth=2, color=_COLOR_CYCLE[0],
+               label=f'{self.scenario} (Severity: {self.severity})', rasterized=True)
+        ax.plot(*self._downsample(time_series, co2_series_2), linewidth=2, color=_COLOR_CYCLE[1],
+               label=f'{other_telemetry.scenario} (Severity: {other_telemetry.severity})', rasterized=True)
+
+        ax.set_xlabel('Time [s]', fontsize=12)
+        ax.set_ylabel('CO2 Concentration [mmHg]', fontsize=12)
+        ax.set_title('CDRA Telemetry Comparison', fontsize=14)
+        ax.grid(True, alpha=0.7)
+        ax.legend()
         #plt.show()
     
     def plot_multiple_scenarios(self, telemetry_list: List['CDRATelemetryData'], 
@@ -944,20 +1130,36 @@ class CDRATelemetryData:
             figsize: Figure size (width, height)
         """
         time_series = self.get_time_series()
-        
-        plt.figure(figsize=figsize)
-        
-        for i, telemetry in enumerate(telemetry_list):
-            co2_series = telemetry.get_co2_time_series_mmhg()
-            plt.plot(time_series, co2_series, linewidth=2, color=get_color_by_index(i),
-                    label=f'{telemetry.scenario} (Severity: {telemetry.severity})')
-        
-        plt.xlabel('Time [s]', fontsize=12)
-        plt.ylabel('CO2 Concentration [mmHg]', fontsize=12)
-        plt.title('Multiple CDRA Scenarios Comparison', fontsize=14)
-        plt.grid(True, alpha=0.7)
-        plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-        plt.tight_layout()
+
+        co2_matrix = [telemetry.get_co2_time_series_mmhg() for telemetry in telemetry_list]
+        for telemetry, co2_series in zip(telemetry_list, co2_matrix):
+            if len(co2_series) != len(time_series):
+                raise ValueError(
+                    f"Telemetry for scenario '{telemetry.scenario}' has "
+                    f"{len(co2_series)} samples but the time axis has "
+                    f"{len(time_series)}; all scenarios must share one time base")
+
+        fig, ax = plt.subplots(figsize=figsize, layout='constrained')
+        handles = []
+
+        # All scenarios go into one LineCollection rather than one Line2D
+        # per scenario; proxy handles supply the legend entries
+        if telemetry_list:
+            ds_time, ds_co2 = self._downsample(time_series, np.stack(co2_matrix, axis=1))
+            colors = [_COLOR_CYCLE[i % len(_COLOR_CYCLE)] for i in range(len(telemetry_list))]
+            segments = [np.column_stack([ds_time, ds_co2[:, i]])
+                        for i in range(len(telemetry_list))]
+            ax.add_collection(LineCollection(segments, colors=colors, linewidths=2, rasterized=True))
+            ax.autoscale_view()
+            handles = [Line2D([], [], color=colors[i], linewidth=2,
+                              label=f'{telemetry.scenario} (Severity: {telemetry.severity})')
+                       for i, telemetry in enumerate(telemetry_list)]
+
+        ax.set_xlabel('Time [s]', fontsize=12)
+        ax.set_ylabel('CO2 Concentration [mmHg]', fontsize=12)
+        ax.set_title('Multiple CDRA Scenarios Comparison', fontsize=14)
+        ax.grid(True, alpha=0.7)
+        ax.legend(handles=handles, bbox_to_anchor=(1.05, 1), loc='upper left')
         #plt.show()
     
     def plot_analysis_summary(self, figsize: Tuple[int, int] = (12, 8)) -> None:
@@ -970,25 +1172,22 @@ class CDRATelemetryData:
         co2_series = self.get_co2_time_series_mmhg()
         time_series = self.get_time_series()
         
-        # Calculate metrics
-        peak_co2 = self.get_peak_co2()
-        final_co2 = self.get_final_co2()
-        avg_co2 = self.get_average_co2()
-        detection_idx = self.find_detection_index(4.0)
+        # Calculate metrics in one pass over the cached series
+        peak_co2, final_co2, avg_co2, detection_idx = self.summarize(4.0)
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=figsize)
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=figsize, layout='constrained')
         
         # CO2 time series with annotations
-        ax1.plot(time_series, co2_series, linewidth=2, color=get_color_by_index(0))
-        ax1.axhline(y=4.0, color=get_color('detection_threshold'), linestyle='--', alpha=0.7, label='Detection Threshold')
+        ax1.plot(*self._downsample(time_series, co2_series), linewidth=2, color=_COLOR_CYCLE[0], rasterized=True)
+        ax1.axhline(y=4.0, color=_SEMANTIC_COLORS['detection_threshold'], linestyle='--', alpha=0.7, label='Detection Threshold')
         
         if detection_idx >= 0:
-            ax1.axvline(x=time_series[detection_idx], color=get_color('detection_line'), linestyle=':', alpha=0.7)
+            ax1.axvline(x=time_series[detection_idx], color=_SEMANTIC_COLORS['detection_line'], linestyle=':', alpha=0.7)
             ax1.annotate(f'Detection at t={time_series[detection_idx]:.0f}s', 
                         xy=(time_series[detection_idx], co2_series[detection_idx]),
                         xytext=(10, 10), textcoords='offset points',
-                        bbox=dict(boxstyle='round,pad=0.3', facecolor=get_color('detection_annotation'), alpha=0.7),
-                        arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
+                        bbox={**_BBOX_PROPS, 'facecolor': _SEMANTIC_COLORS['detection_annotation']},
+                        arrowprops=_ARROW_PROPS)
         
         ax1.set_xlabel('Time [s]')
         ax1.set_ylabel('CO2 Concentration [mmHg]')
@@ -999,7 +1198,7 @@ class CDRATelemetryData:
         # Metrics bar chart
         metrics = ['Peak CO2', 'Final CO2', 'Average CO2']
         values = [peak_co2, final_co2, avg_co2]
-        colors = [get_color_by_index(i) for i in range(len(metrics))]
+        colors = [_COLOR_CYCLE[i] for i in range(len(metrics))]
         
         bars = ax2.bar(metrics, values, color=colors, alpha=0.7)
         ax2.set_ylabel('CO2 Concentration [mmHg]')
@@ -1007,13 +1206,9 @@ class CDRATelemetryData:
         ax2.grid(True, alpha=0.7, axis='y')
         
         # Add value labels on bars
-        for bar, value in zip(bars, values):
-            height = bar.get_height()
-            ax2.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                    f'{value:.2f}', ha='center', va='bottom')
+        ax2.bar_label(bars, labels=[f'{value:.2f}' for value in values], padding=3)
         
-        plt.suptitle(f'Analysis Summary - {self.scenario} (Severity: {self.severity})', fontsize=14)
-        plt.tight_layout()
+        fig.suptitle(f'Analysis Summary - {self.scenario} (Severity: {self.severity})', fontsize=14)
         #plt.show()
 
 
@@ -1025,37 +1220,40 @@ class CDRAState:
     This class holds the current state of the CDRA simulation including
     component saturations, efficiencies, and historical data.
     """
-    
-    def __init__(self, baseline_co2: float):
+
+    __slots__ = ('saturation', 'adsorption_eff', 'time', 'air_flow_rate',
+                 'co2_content', 'heater_on', 'path_1_active', 'history')
+
+    def __init__(self, baseline_co2: float, max_steps: int = 0):
         """
         Initialize CDRA state.
-        
+
         Args:
             baseline_co2: Initial CO2 concentration in kg/kg air
+            max_steps: Number of simulation steps to preallocate history for
         """
-        self.saturation = {k: 0.0 for k in ['desiccant_1', 'desiccant_3', 'sorbent_2', 'sorbent_4']}
-        self.adsorption_eff = {k: 0.05 for k in ['desiccant_1', 'desiccant_3', 'sorbent_2', 'sorbent_4']}
+        self.saturation = np.zeros(len(COMPONENTS))
+        self.adsorption_eff = np.full(len(COMPONENTS), 0.05)
         self.time = 0
         self.air_flow_rate = 1.0
         self.co2_content = baseline_co2
-        self.heater_on = {'desiccant_1': False, 'desiccant_3': False, 'sorbent_2': False, 'sorbent_4': False}
-        self.valve_state = {'path_1_active': True}
+        self.heater_on = np.zeros(len(COMPONENTS), dtype=np.bool_)
+        self.path_1_active = True
 
-        # For plotting and analysis
+        # For plotting and analysis: one preallocated array per channel,
+        # written by step index instead of list appends. Per-component
+        # channels are (max_steps, 4) with columns in COMPONENTS order.
+        # Continuous channels are stored as float32 (ample for plotting and
+        # mmHg-level analysis) and boolean channels as uint8/bool_; the live
+        # simulation state above stays float64 to avoid roundoff build-up.
+        n = int(max_steps)
         self.history = {
-            'saturation': {k: [] for k in ['desiccant_1', 'desiccant_3', 'sorbent_2', 'sorbent_4']},
-            'adsorption_eff': {k: [] for k in ['desiccant_1', 'desiccant_3', 'sorbent_2', 'sorbent_4']},
-            'time': [],
-            'moisture_content': [],
-            'co2_content': [],
-            'co2_output': [],  # CO2 concentration out of CDRA
-            'co2_removed': [],
-            'air_flow_rate': [],
-            'desiccant_heaters': [],
-            'sorbent_heaters': [],
-            'active_path': [],
-            'desiccant_1_heater': [],
-            'desiccant_3_heater': [],
-            'sorbent_2_heater': [],
-            'sorbent_4_heater': []
+            'saturation': np.zeros((n, len(COMPONENTS)), dtype=np.float32),
+            'adsorption_eff': np.zeros((n, len(COMPONENTS)), dtype=np.float32),
+            'time': np.zeros(n, dtype=np.float32),
+            'co2_content': np.zeros(n, dtype=np.float32),
+            'co2_output': np.zeros(n, dtype=np.float32),  # CO2 concentration out of CDRA
+            'air_flow_rate': np.zeros(n, dtype=np.float32),
+            'heater': np.zeros((n, len(COMPONENTS)), dtype=np.uint8),
+            'active_path': np.zeros(n, dtype=np.bool_),
         }
@@ -1,9 +1,20 @@
 import numpy as np
+import threading
 import time
-from sklearn.metrics import mean_squared_error, mean_absolute_error
-from scipy.stats import pearsonr, spearmanr
-from dtaidistance import dtw
-from dtaidistance import dtw_visualisation as dtwvis
+from concurrent.futures import ThreadPoolExecutor
+from scipy.signal import fftconvolve
+from scipy.stats import pearsonr, spearmanr, rankdata
+try:
+    from dtaidistance import dtw
+    from dtaidistance import dtw_visualisation as dtwvis
+    DTW_AVAILABLE = True
+except ImportError:
+    DTW_AVAILABLE = False
+    print("Warning: dtaidistance not available. Using the pure-Python DTW fallback.")
+try:
+    from driver._dtw_fallback import dtw_distance as _fallback_dtw_distance
+except ImportError:
+    from _dtw_fallback import dtw_distance as _fallback_dtw_distance
 try:
     from statsmodels.tsa.arima.model import ARIMA
     ARIMA_AVAILABLE = True
@@ -21,35 +32,60 @@ class SimilarityAgent:
     using various statistical methods including MSE, Pearson correlation, and DTW.
     """
     
-    def __init__(self, method: str = "MSE"):
+    def __init__(self, method: str = "MSE", dtw_window: Optional[int] = None):
         """
         Initialize the SimilarityAgent.
-        
+
         Args:
             method (str): The similarity method to use. Options: "MSE", "Pearson", "DTW"
+            dtw_window (int, optional): Sakoe-Chiba band radius for DTW. Limits
+                warping-path deviation from the diagonal; defaults to 10% of
+                the segment length when not given
         """
         self.method = method.upper()
         self.available_methods = ["MSE", "MAE", "PEARSON", "SPEARMAN", "DTW", "ARIMA", "FFT"]
-        
+        self.dtw_window = dtw_window
+        # Scratch space reused by _sliding_search across scenarios; kept
+        # thread-local so the n_jobs path does not share buffers
+        self._scratch = threading.local()
+
         if self.method not in self.available_methods:
             raise ValueError(f"Method {method} not supported. Available methods: {self.available_methods}")
     
     def compute_multiple_similarities(
-        self, 
-        telemetry_data: np.ndarray, 
+        self,
+        telemetry_data: np.ndarray,
         simulation_data_dict: Dict[str, np.ndarray],
         segment_length: Optional[int] = None,
-        find_best_alignment: bool = True
+        find_best_alignment: bool = True,
+        n_jobs: Optional[int] = None
     ) -> Dict[str, Dict]:
         """
         Compute similarity scores between telemetry data and multiple simulation scenarios.
+
+        Scenarios are independent, so with n_jobs set they are scored on a
+        thread pool; the NumPy/C kernels release the GIL, so threads overlap.
+        n_jobs of None or 1 keeps the sequential path; a non-positive value
+        uses the executor's default worker count.
         """
+        if n_jobs is not None and n_jobs != 1 and len(simulation_data_dict) > 1:
+            max_workers = n_jobs if n_jobs > 0 else None
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    scenario_name: executor.submit(
+                        self.compute_similarity, telemetry_data, simulation_data,
+                        segment_length, find_best_alignment)
+                    for scenario_name, simulation_data in simulation_data_dict.items()
+                }
+                return {scenario_name: future.result()
+                        for scenario_name, future in futures.items()}
+
         results = {}
         for scenario_name, simulation_data in simulation_data_dict.items():
             results[scenario_name] = self.compute_similarity(
-                telemetry_data, 
-                simulation_data, 
-                segment_length, 
+                telemetry_data,
+                simulation_data,
+                segment_length,
                 find_best_alignment
             )
         return results
@@ -71,11 +107,20 @@ class SimilarityAgent:
             find_best_alignment (bool): Whether to find the best time alignment between datasets
             
         Returns:
-            Dict: Dictionary containing similarity score, runtime, and alignment info
+            Dict: Dictionary containing similarity score, runtime, and alignment info.
+            For the elementwise methods, inputs are processed in float32, so
+            scores can differ from float64 around the sixth significant digit
         """
         if segment_length is None:
             segment_length = min(len(telemetry_data), len(simulation_data))
-        
+
+        # The elementwise reduction methods tolerate single precision and
+        # move half the bytes for it; DTW's C backend and the ARIMA fit stay
+        # in float64
+        if self.method in ("MSE", "MAE", "PEARSON", "SPEARMAN", "FFT"):
+            telemetry_data = np.ascontiguousarray(telemetry_data, dtype=np.float32)
+            simulation_data = np.ascontiguousarray(simulation_data, dtype=np.float32)
+
         start_time = time.time()
         
         if self.method == "MSE":
@@ -99,38 +144,105 @@ class SimilarityAgent:
         
         return result
     
+    # Sweeps longer than this switch to lower-bound pruning, scored in
+    # blocks of _PRUNE_BLOCK candidate shifts at a time
+    _PRUNE_MIN_SHIFTS = 4096
+    _PRUNE_BLOCK = 1024
+
+    def _sliding_search(
+        self,
+        telemetry_data: np.ndarray,
+        simulation_data: np.ndarray,
+        segment_length: int,
+        reduce_diff,
+        mean_lower_bound=None
+    ) -> Dict:
+        """
+        Score every alignment of the simulation segment against the telemetry.
+
+        The sliding-window view exposes all telemetry segments as rows without
+        copying; reduce_diff maps the (shifts, segment_length) difference
+        matrix to one score per shift (lower is better) in a single pass.
+
+        For very long sweeps, mean_lower_bound enables Keogh-style pruning:
+        it maps the window-vs-segment mean difference to a provable lower
+        bound on the score, candidates are visited in lower-bound order, and
+        the sweep stops once no remaining candidate can beat the best score.
+
+        Args:
+            telemetry_data (np.ndarray): Actual telemetry data
+            simulation_data (np.ndarray): Simulation data to compare against
+            segment_length (int): Length of segments to compare
+            reduce_diff: Callable reducing a 2-D difference matrix row-wise
+            mean_lower_bound: Optional callable mapping mean differences to
+                score lower bounds
+
+        Returns:
+            Dict: Result dictionary with the best score, shift, and segments
+        """
+        simulation_segment = simulation_data[:segment_length]
+        windows = np.lib.stride_tricks.sliding_window_view(telemetry_data, segment_length)
+        n_shifts = windows.shape[0]
+
+        if mean_lower_bound is not None and n_shifts > self._PRUNE_MIN_SHIFTS:
+            # Window means come from one cumulative sum; by Jensen's
+            # inequality the mean difference bounds both MSE and MAE from
+            # below, so candidates whose bound exceeds the best exact score
+            # can be skipped without scoring them
+            cs = np.cumsum(np.concatenate(([0.0], telemetry_data)), dtype=np.float64)
+            window_mean = (cs[segment_length:] - cs[:-segment_length]) / segment_length
+            bounds = mean_lower_bound(window_mean - simulation_segment.mean())
+            order = np.argsort(bounds)
+
+            best_score = float("inf")
+            best_shift = 0
+            for start in range(0, n_shifts, self._PRUNE_BLOCK):
+                block = order[start:start + self._PRUNE_BLOCK]
+                if bounds[block[0]] >= best_score:
+                    break
+                block_scores = reduce_diff(windows[block] - simulation_segment)
+                pos = int(np.argmin(block_scores))
+                if block_scores[pos] < best_score:
+                    best_score = float(block_scores[pos])
+                    best_shift = int(block[pos])
+        else:
+            # The materialized difference matrix is the dominant allocation
+            # of a scenario sweep; reuse one scratch buffer per thread
+            buf = getattr(self._scratch, 'diff_buf', None)
+            if (buf is None or buf.shape[0] < n_shifts
+                    or buf.shape[1] != segment_length or buf.dtype != windows.dtype):
+                buf = np.empty(windows.shape, dtype=windows.dtype)
+                self._scratch.diff_buf = buf
+            diff = np.subtract(windows, simulation_segment, out=buf[:n_shifts])
+            scores = reduce_diff(diff)
+            best_shift = int(np.argmin(scores))
+            best_score = float(scores[best_shift])
+
+        return {
+            'score': best_score,
+            'shift': best_shift,
+            'aligned_telemetry': telemetry_data[best_shift:best_shift + segment_length],
+            'aligned_simulation': simulation_segment
+        }
+
     def _compute_mse(
-        self, 
-        telemetry_data: np.ndarray, 
-        simulation_data: np.ndarray, 
+        self,
+        telemetry_data: np.ndarray,
+        simulation_data: np.ndarray,
         segment_length: int,
         find_best_alignment: bool
     ) -> Dict:
         """Compute Mean Squared Error between datasets."""
         if find_best_alignment:
-            best_score = float("inf")
-            best_shift = 0
-            
-            for shift in range(len(telemetry_data) - segment_length + 1):
-                telemetry_segment = telemetry_data[shift:shift + segment_length]
-                simulation_segment = simulation_data[:segment_length]
-                score = mean_squared_error(telemetry_segment, simulation_segment)
-                
-                if score < best_score:
-                    best_score = score
-                    best_shift = shift
-            
-            return {
-                'score': best_score,
-                'shift': best_shift,
-                'aligned_telemetry': telemetry_data[best_shift:best_shift + segment_length],
-                'aligned_simulation': simulation_data[:segment_length]
-            }
+            return self._sliding_search(
+                telemetry_data, simulation_data, segment_length,
+                lambda diff: np.einsum('ij,ij->i', diff, diff) / segment_length,
+                mean_lower_bound=np.square)
         else:
             # Use the first segment_length elements from both datasets
             telemetry_segment = telemetry_data[:segment_length]
             simulation_segment = simulation_data[:segment_length]
-            score = mean_squared_error(telemetry_segment, simulation_segment)
+            score = float(np.square(np.subtract(telemetry_segment, simulation_segment)).mean())
             
             return {
                 'score': score,
@@ -148,23 +260,32 @@ class SimilarityAgent:
     ) -> Dict:
         """Compute Pearson correlation between datasets."""
         if find_best_alignment:
-            best_score = -1
-            best_shift = 0
-            
-            for shift in range(len(telemetry_data) - segment_length + 1):
-                telemetry_segment = telemetry_data[shift:shift + segment_length]
-                simulation_segment = simulation_data[:segment_length]
-                score, _ = pearsonr(telemetry_segment, simulation_segment)
-                
-                if score > best_score:
-                    best_score = score
-                    best_shift = shift
-            
+            # Only the window statistics and the cross-sum vary with the
+            # shift: rolling means/variances come from cumulative sums and
+            # every cross-sum from one FFT convolution with the fixed
+            # simulation segment, so no per-shift pearsonr calls are needed
+            simulation_segment = simulation_data[:segment_length]
+            n = segment_length
+            cs = np.cumsum(np.concatenate(([0.0], telemetry_data)), dtype=np.float64)
+            cs2 = np.cumsum(np.concatenate(([0.0], np.square(telemetry_data, dtype=np.float64))))
+            window_mean = (cs[n:] - cs[:-n]) / n
+            window_var = (cs2[n:] - cs2[:-n]) / n - np.square(window_mean)
+            cross = fftconvolve(telemetry_data, simulation_segment[::-1], mode='valid')
+            sim_mean = simulation_segment.mean()
+            sim_var = simulation_segment.var()
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scores = (cross / n - window_mean * sim_mean) / np.sqrt(window_var * sim_var)
+            # Constant windows have zero variance; rank them below any
+            # genuine correlation
+            scores = np.where(np.isfinite(scores), scores, -np.inf)
+            best_shift = int(np.argmax(scores))
+
             return {
-                'score': best_score,
+                'score': float(scores[best_shift]),
                 'shift': best_shift,
                 'aligned_telemetry': telemetry_data[best_shift:best_shift + segment_length],
-                'aligned_simulation': simulation_data[:segment_length]
+                'aligned_simulation': simulation_segment
             }
         else:
             # Use the first segment_length elements from both datasets
@@ -187,36 +308,52 @@ class SimilarityAgent:
         find_best_alignment: bool
     ) -> Dict:
         """Compute Dynamic Time Warping distance between datasets."""
+        # The C backend requires contiguous float64 input; the Sakoe-Chiba
+        # band caps warping-path deviation so each distance is O(L*window)
+        # instead of O(L^2), and pruning abandons hopeless alignments early
+        simulation_segment = np.ascontiguousarray(simulation_data[:segment_length], dtype=np.float64)
+        window = self.dtw_window if self.dtw_window is not None else max(segment_length // 10, 1)
+
         if find_best_alignment:
-            best_score = float("inf")
-            best_shift = 0
-            
-            for shift in range(len(telemetry_data) - segment_length + 1):
-                telemetry_segment = telemetry_data[shift:shift + segment_length]
-                simulation_segment = simulation_data[:segment_length]
-                score = dtw.distance(telemetry_segment, simulation_segment)
-                
-                if score < best_score:
-                    best_score = score
-                    best_shift = shift
-            
+            segments = [np.ascontiguousarray(telemetry_data[shift:shift + segment_length], dtype=np.float64)
+                        for shift in range(len(telemetry_data) - segment_length + 1)]
+            if DTW_AVAILABLE:
+                # One batched C call for the whole sweep: every telemetry
+                # segment plus the simulation segment go in one list, and the
+                # block restricts the matrix to segment-vs-simulation
+                # distances only
+                series = segments + [simulation_segment]
+                n = len(series)
+                distances = dtw.distance_matrix_fast(
+                    series, window=window, use_pruning=True,
+                    block=((0, n - 1), (n - 1, n)))
+                scores = distances[:n - 1, n - 1]
+            else:
+                scores = np.array([_fallback_dtw_distance(segment, simulation_segment, window=window)
+                                   for segment in segments])
+            best_shift = int(np.argmin(scores))
+
             return {
-                'score': best_score,
+                'score': float(scores[best_shift]),
                 'shift': best_shift,
                 'aligned_telemetry': telemetry_data[best_shift:best_shift + segment_length],
                 'aligned_simulation': simulation_data[:segment_length]
             }
         else:
             # Use the first segment_length elements from both datasets
-            telemetry_segment = telemetry_data[:segment_length]
-            simulation_segment = simulation_data[:segment_length]
-            score = dtw.distance(telemetry_segment, simulation_segment)
-            
+            telemetry_segment = np.ascontiguousarray(telemetry_data[:segment_length], dtype=np.float64)
+            if DTW_AVAILABLE:
+                score = dtw.distance_fast(telemetry_segment, simulation_segment,
+                                          window=window, use_pruning=True)
+            else:
+                score = _fallback_dtw_distance(telemetry_segment, simulation_segment,
+                                               window=window)
+
             return {
                 'score': score,
                 'shift': 0,
-                'aligned_telemetry': telemetry_segment,
-                'aligned_simulation': simulation_segment
+                'aligned_telemetry': telemetry_data[:segment_length],
+                'aligned_simulation': simulation_data[:segment_length]
             }
     
     def _compute_mae(
@@ -228,29 +365,15 @@ class SimilarityAgent:
     ) -> Dict:
         """Compute Mean Absolute Error between datasets."""
         if find_best_alignment:
-            best_score = float("inf")
-            best_shift = 0
-            
-            for shift in range(len(telemetry_data) - segment_length + 1):
-                telemetry_segment = telemetry_data[shift:shift + segment_length]
-                simulation_segment = simulation_data[:segment_length]
-                score = mean_absolute_error(telemetry_segment, simulation_segment)
-                
-                if score < best_score:
-                    best_score = score
-                    best_shift = shift
-            
-            return {
-                'score': best_score,
-                'shift': best_shift,
-                'aligned_telemetry': telemetry_data[best_shift:best_shift + segment_length],
-                'aligned_simulation': simulation_data[:segment_length]
-            }
+            return self._sliding_search(
+                telemetry_data, simulation_data, segment_length,
+                lambda diff: np.abs(diff).mean(axis=1),
+                mean_lower_bound=np.abs)
         else:
             # Use the first segment_length elements from both datasets
             telemetry_segment = telemetry_data[:segment_length]
             simulation_segment = simulation_data[:segment_length]
-            score = mean_absolute_error(telemetry_segment, simulation_segment)
+            score = float(np.abs(np.subtract(telemetry_segment, simulation_segment)).mean())
             
             return {
                 'score': score,
@@ -268,23 +391,27 @@ class SimilarityAgent:
     ) -> Dict:
         """Compute Spearman rank correlation between datasets."""
         if find_best_alignment:
-            best_score = -1
-            best_shift = 0
-            
-            for shift in range(len(telemetry_data) - segment_length + 1):
-                telemetry_segment = telemetry_data[shift:shift + segment_length]
-                simulation_segment = simulation_data[:segment_length]
-                score, _ = spearmanr(telemetry_segment, simulation_segment)
-                
-                if score > best_score:
-                    best_score = score
-                    best_shift = shift
-            
+            # Spearman is Pearson on ranks: rank all telemetry windows in one
+            # rankdata call over the window matrix, rank the simulation
+            # segment once, and correlate every row against it vectorized
+            simulation_segment = simulation_data[:segment_length]
+            windows = np.lib.stride_tricks.sliding_window_view(telemetry_data, segment_length)
+            telemetry_ranks = rankdata(windows, axis=1)
+            sim_ranks = rankdata(simulation_segment)
+            rank_dev = telemetry_ranks - telemetry_ranks.mean(axis=1, keepdims=True)
+            sim_dev = sim_ranks - sim_ranks.mean()
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scores = (rank_dev @ sim_dev) / np.sqrt(
+                    np.einsum('ij,ij->i', rank_dev, rank_dev) * np.square(sim_dev).sum())
+            scores = np.where(np.isfinite(scores), scores, -np.inf)
+            best_shift = int(np.argmax(scores))
+
             return {
-                'score': best_score,
+                'score': float(scores[best_shift]),
                 'shift': best_shift,
                 'aligned_telemetry': telemetry_data[best_shift:best_shift + segment_length],
-                'aligned_simulation': simulation_data[:segment_length]
+                'aligned_simulation': simulation_segment
             }
         else:
             # Use the first segment_length elements from both datasets
@@ -318,28 +445,24 @@ class SimilarityAgent:
         
         try:
             if find_best_alignment:
-                best_score = float("inf")
-                best_shift = 0
-                
-                for shift in range(len(telemetry_data) - segment_length + 1):
-                    telemetry_segment = telemetry_data[shift:shift + segment_length]
-                    simulation_segment = simulation_data[:segment_length]
-                    
-                    # Fit ARIMA model on simulation data
-                    model = ARIMA(simulation_segment, order=(2, 1, 0)).fit()
-                    forecast = model.predict(start=1, end=len(telemetry_segment) - 1)
-                    observed_trimmed = telemetry_segment[1:]
-                    score = mean_squared_error(observed_trimmed, forecast)
-                    
-                    if score < best_score:
-                        best_score = score
-                        best_shift = shift
-                
+                # The model depends only on the simulation segment, which is
+                # the same for every shift: fit and forecast once, then score
+                # all telemetry windows against the forecast in one pass
+                simulation_segment = simulation_data[:segment_length]
+                model = ARIMA(simulation_segment, order=(2, 1, 0)).fit()
+                forecast = model.predict(start=1, end=segment_length - 1)
+
+                windows = np.lib.stride_tricks.sliding_window_view(
+                    telemetry_data, segment_length)[:, 1:]
+                diff = windows - forecast
+                scores = np.einsum('ij,ij->i', diff, diff) / (segment_length - 1)
+                best_shift = int(np.argmin(scores))
+
                 return {
-                    'score': best_score,
+                    'score': float(scores[best_shift]),
                     'shift': best_shift,
                     'aligned_telemetry': telemetry_data[best_shift:best_shift + segment_length],
-                    'aligned_simulation': simulation_data[:segment_length]
+                    'aligned_simulation': simulation_segment
                 }
             else:
                 # Use the first segment_length elements from both datasets
@@ -350,7 +473,7 @@ class SimilarityAgent:
                 model = ARIMA(simulation_segment, order=(2, 1, 0)).fit()
                 forecast = model.predict(start=1, end=len(telemetry_segment) - 1)
                 observed_trimmed = telemetry_segment[1:]
-                score = mean_squared_error(observed_trimmed, forecast)
+                score = float(np.square(np.subtract(observed_trimmed, forecast)).mean())
                 
                 return {
                     'score': score,
@@ -375,51 +498,47 @@ class SimilarityAgent:
         segment_length: int,
         find_best_alignment: bool
     ) -> Dict:
-        """Compute FFT-based similarity using cross-power spectrum."""
+        """Compute FFT-based similarity using normalized cross-correlation."""
+        simulation_segment = simulation_data[:segment_length]
+        sim_norm = float(np.sqrt(np.square(simulation_segment).sum()))
+
         if find_best_alignment:
-            best_score = float("inf")
-            best_shift = 0
-            
-            for shift in range(len(telemetry_data) - segment_length + 1):
-                telemetry_segment = telemetry_data[shift:shift + segment_length]
-                simulation_segment = simulation_data[:segment_length]
-                
-                # Compute FFT
-                fft_telemetry = np.fft.fft(telemetry_segment)
-                fft_simulation = np.fft.fft(simulation_segment)
-                
-                # Cross power spectrum
-                cross_spectrum = fft_telemetry * np.conj(fft_simulation)
-                
-                # Use negative correlation of cross-spectrum magnitude as similarity
-                # (higher correlation = lower score)
-                score = -np.corrcoef(np.abs(fft_telemetry), np.abs(fft_simulation))[0, 1]
-                
-                if score < best_score:
-                    best_score = score
-                    best_shift = shift
-            
+            # One FFT pair covers the whole sweep: the inverse transform of
+            # FFT(telemetry) * conj(FFT(simulation)) is the cross-correlation
+            # at every shift. The old per-shift loop correlated spectrum
+            # magnitudes, which are shift-invariant, so every shift received
+            # the same score and the reported alignment was meaningless.
+            n_shifts = len(telemetry_data) - segment_length + 1
+            size = len(telemetry_data) + segment_length
+            fft_telemetry = np.fft.rfft(telemetry_data, size)
+            fft_simulation = np.fft.rfft(simulation_segment, size)
+            correlation = np.fft.irfft(fft_telemetry * np.conj(fft_simulation), size)[:n_shifts]
+
+            # Normalize by the window and segment energies so each score is a
+            # negated cosine similarity (lower is better, minimum -1)
+            cs2 = np.cumsum(np.concatenate(([0.0], np.square(telemetry_data, dtype=np.float64))))
+            window_energy = cs2[segment_length:] - cs2[:-segment_length]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scores = -correlation / (np.sqrt(window_energy) * sim_norm)
+            scores = np.where(np.isfinite(scores), scores, np.inf)
+            best_shift = int(np.argmin(scores))
+
             return {
-                'score': best_score,
+                'score': float(scores[best_shift]),
                 'shift': best_shift,
                 'aligned_telemetry': telemetry_data[best_shift:best_shift + segment_length],
-                'aligned_simulation': simulation_data[:segment_length]
+                'aligned_simulation': simulation_segment
             }
         else:
             # Use the first segment_length elements from both datasets
             telemetry_segment = telemetry_data[:segment_length]
-            simulation_segment = simulation_data[:segment_length]
-            
-            # Compute FFT
-            fft_telemetry = np.fft.fft(telemetry_segment)
-            fft_simulation = np.fft.fft(simulation_segment)
-            
-            # Cross power spectrum
-            cross_spectrum = fft_telemetry * np.conj(fft_simulation)
-            
-            # Use negative correlation of cross-spectrum magnitude as similarity
-            score = -np.corrcoef(np.abs(fft_telemetry), np.abs(fft_simulation))[0, 1]
-            
+            telemetry_norm = float(np.sqrt(np.square(telemetry_segment).sum()))
+            denominator = telemetry_norm * sim_norm
+            if denominator > 0.0:
+                score = -float(np.dot(telemetry_segment, simulation_segment)) / denominator
+            else:
+                score = float("inf")
+
             return {
                 'score': score,
                 'shift': 0,
@@ -66,7 +66,6 @@ def build_nominal_templates():
     return templates
 
 def find_detection_index(template, trigger):
-    print(template)
     return np.argmax(template > trigger)
 
 def apply_uncertainty(series, noise):